@@ -14,7 +14,12 @@ from Game.card_combinations import card_combinations
 
 class CardTools():
 	def __init__(self):
-		pass
+		HC, CC = constants.hand_count, constants.card_count
+		# hand index -> private cards table [I,2] (used for batched masks)
+		self.hand_cards_table = np.zeros([HC, constants.hand_card_count], dtype=arguments.int_dtype)
+		for card1 in range(CC):
+			for card2 in range(card1+1,CC):
+				self.hand_cards_table[ self.get_hand_index([card1, card2]) ] = [card1, card2]
 
 	def convert_board_to_nn_feature(self, board):
 		'''
@@ -75,6 +80,43 @@ class CardTools():
 		return out
 
 
+	def convert_boards_to_nn_features_batch(self, boards):
+		''' Batched version of self.convert_board_to_nn_feature
+		@param: [B,0-5]     :tensor of boards, where card is unique index (int)
+		@return [B,52+4+13] :tensor of shape [B, total cards in deck + suit count + rank count]
+		'''
+		num_ranks, num_suits, num_cards = constants.rank_count, constants.suit_count, constants.card_count
+		BC = boards.shape[0]
+		out = np.zeros([BC, num_cards + num_suits + num_ranks], dtype=np.float32)
+		if boards.ndim < 2 or boards.shape[1] == 0: # no cards were placed
+			return out
+		assert((boards >= 0).all()) # all cards are indexes 0 - 51
+		rows = np.arange(BC).reshape([BC,1])
+		# encode cards, so that all ones show what card is placed
+		out[ rows, boards ] = 1
+		# count number of different suits and ranks on every board
+		suits = card_to_string.card_to_suit_table[ boards ] # [B,0-5]
+		ranks = card_to_string.card_to_rank_table[ boards ] # [B,0-5]
+		np.add.at(out, (rows, num_cards + suits), 1 / num_suits)
+		np.add.at(out, (rows, num_cards + num_suits + ranks), 1 / num_ranks)
+		return out
+
+
+	def get_possible_hands_masks_batch(self, boards):
+		''' Batched version of self.get_possible_hands_mask
+		@param: [B,0-5] :tensor of boards, where card is unique index (int)
+		@return [B,I]   :tensor with an entry for every board and possible hand (private card),
+				which is `1` if the hand shares no cards with the board and `0` otherwise
+		'''
+		CC, BC = constants.card_count, boards.shape[0]
+		used = np.zeros([BC, CC], dtype=bool)
+		if boards.ndim == 2 and boards.shape[1] > 0:
+			used[ np.arange(BC).reshape([BC,1]), boards ] = True
+		# hand is possible if none of its cards are used on board: [B,I] = [B,I] | [B,I]
+		blocked = used[ : , self.hand_cards_table[:,0] ] | used[ : , self.hand_cards_table[:,1] ]
+		return np.logical_not(blocked).astype(arguments.int_dtype)
+
+
 	def same_boards(self, board1, board2):
 		''' checks if board1 == board2
 		@param: [0-5] :vector of board cards, where card is unique index (int)
@@ -0,0 +1,64 @@
+'''
+	Compiled kernels, that fill neural network board features and possible hands masks
+	for all next round boards. Uses numba if it is installed,
+	otherwise falls back to batched numpy versions from card_tools.
+'''
+import numpy as np
+
+from Settings.constants import constants
+from Game.card_tools import card_tools
+
+try:
+	from numba import njit, prange
+	NUMBA_AVAILABLE = True
+except ImportError:
+	NUMBA_AVAILABLE = False
+
+CC, SC, RC = constants.card_count, constants.suit_count, constants.rank_count
+# hand index -> private cards table [I,2]
+hand_cards_table = card_tools.hand_cards_table.astype(np.int8)
+
+
+if NUMBA_AVAILABLE:
+	@njit(parallel=True, cache=True)
+	def fill_board_features(boards, out_feats):
+		'''
+		@param: [B,0-5]     :tensor of boards, where card is unique index (int)
+		@param: [B,52+4+13] :zeroed tensor to fill with board features (see card_tools.convert_board_to_nn_feature)
+		'''
+		for i in prange(boards.shape[0]):
+			for j in range(boards.shape[1]):
+				card = boards[i,j]
+				out_feats[ i, card ] = 1
+				out_feats[ i, CC + card % SC ] += 1 / SC
+				out_feats[ i, CC + SC + card // SC ] += 1 / RC
+
+
+	@njit(parallel=True, cache=True)
+	def fill_board_masks(boards, hand_cards_table, out_mask):
+		'''
+		@param: [B,0-5] :tensor of boards, where card is unique index (int)
+		@param: [I,2]   :hand index -> private cards table
+		@param: [B,I]   :tensor to fill with possible hands masks (see card_tools.get_possible_hands_mask)
+		'''
+		for i in prange(boards.shape[0]):
+			used = np.zeros(CC, dtype=np.bool_)
+			for j in range(boards.shape[1]):
+				used[ boards[i,j] ] = True
+			for hand in range(hand_cards_table.shape[0]):
+				out_mask[ i, hand ] = not (used[ hand_cards_table[hand,0] ] or used[ hand_cards_table[hand,1] ])
+
+else:
+	def fill_board_features(boards, out_feats):
+		''' numpy fallback of fill_board_features '''
+		out_feats[ : , : ] = card_tools.convert_boards_to_nn_features_batch(boards)
+
+
+	def fill_board_masks(boards, hand_cards_table, out_mask):
+		''' numpy fallback of fill_board_masks '''
+		out_mask[ : , : ] = card_tools.get_possible_hands_masks_batch(boards)
+
+
+
+
+#
@@ -0,0 +1,56 @@
+'''
+	Compiled kernels, used in NextRoundValue.evaluate_ranges for preparing
+	neural network input ranges. Uses numba if it is installed,
+	otherwise falls back to numpy.
+'''
+import numpy as np
+
+try:
+	from numba import njit, prange
+	NUMBA_AVAILABLE = True
+except ImportError:
+	NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+	@njit(parallel=True, fastmath=True, cache=True)
+	def mask_normalize(ranges, mask, out_ranges, out_sum):
+		''' copies ranges for every board, masks not possible hands and normalizes them (in single pass over hands)
+		@param: [b,P,I]   :ranges
+		@param: [B,I]     :possible hands mask for every board
+		@param: [b,B,P,I] :tensor to fill with masked and normalized ranges
+		@param: [b,B,P]   :tensor to fill with masked ranges sums (before normalization)
+		'''
+		batch_size, BC, PC, HC = out_ranges.shape
+		for idx in prange(batch_size * BC * PC):
+			b, B, p = idx // (BC * PC), (idx // PC) % BC, idx % PC
+			s = 0.0
+			for h in range(HC):
+				value = ranges[b,p,h] * mask[B,h]
+				out_ranges[b,B,p,h] = value
+				s += value
+			out_sum[b,B,p] = s
+			# eliminating division by 0 (ranges with 0 sum are all zeros)
+			if s != 0:
+				for h in range(HC):
+					out_ranges[b,B,p,h] /= s
+
+else:
+	def mask_normalize(ranges, mask, out_ranges, out_sum):
+		''' numpy fallback of mask_normalize '''
+		batch_size, BC, PC, HC = out_ranges.shape
+		# copy ranges for all boards: [b,B,P,I] = [b,1,P,I]
+		np.copyto(out_ranges, ranges.reshape([batch_size,1,PC,HC]))
+		# mask ranges for not possible hands: [b,B,P,I] *= [1,B,1,I]
+		np.multiply(out_ranges, mask.reshape([1,BC,1,HC]), out=out_ranges)
+		# [b,B,P] = sum([b,B,P,I], axis=3)
+		np.sum(out_ranges, axis=3, out=out_sum)
+		# normalizing ranges: [b,B,P,I] /= [b,B,P,1]
+		# (ranges with 0 sum are all zeros, so they are skipped instead of dividing by 1)
+		ranges_sum = out_sum[ : , : , : , np.newaxis ]
+		np.divide(out_ranges, ranges_sum, out=out_ranges, where=ranges_sum != 0)
+
+
+
+
+#
@@ -4,6 +4,7 @@
 	On last iterations, uses next street/round root states and averages them.
 '''
 import numpy as np
+from collections import OrderedDict
 
 from Settings.arguments import arguments
 from Settings.constants import constants
@@ -11,6 +12,34 @@ from Game.card_tools import card_tools
 from Game.card_to_string_conversion import card_to_string
 from Game.card_combinations import card_combinations
 from NeuralNetwork.value_nn import ValueNn
+from NeuralNetwork._board_kernels import fill_board_features, fill_board_masks, hand_cards_table
+from NeuralNetwork._range_kernels import mask_normalize
+
+# scratch buffers for big [b,B,...] tensors, shared by all NextRoundValue instances
+# (only one street is evaluated at a time, so peak memory is max over streets, not sum)
+_SCRATCH = {}
+_SCRATCH_OWNERS = {}
+
+def _get_scratch(name, shape, dtype, owner, zeroed=True):
+	''' Gives view of shared scratch buffer, growing it if it's too small.
+		Previous owner of that buffer must not use it anymore (see NextRoundValue._owns_scratch)
+	@param: str   :name of the buffer
+	@param: list  :shape of the view
+	@param: dtype :datatype of the view
+	@param: obj   :instance, that will use this buffer
+	@param: bool  :zero the view (not needed if it's fully overwritten before reading)
+	@return [...] :view of shape `shape`
+	'''
+	size = int(np.prod(shape))
+	buffer = _SCRATCH.get(name)
+	if buffer is None or buffer.dtype != dtype or buffer.size < size:
+		buffer = _SCRATCH[name] = np.empty([size], dtype=dtype)
+	_SCRATCH_OWNERS[name] = owner
+	out = buffer[ :size ].reshape(shape)
+	if zeroed:
+		out.fill(0)
+	return out
+
 
 class NextRoundValue():
 	def __init__(self, street, skip_iterations, leaf_nodes_iterations=0):
@@ -20,6 +49,11 @@ class NextRoundValue():
 		@param: int :iterations used for faster approximation (approximates current street/round leaf nodes)
 		'''
 		self.street = street
+		# LRU cache of (next boards features, next boards mask), keyed by sorted current board
+		self._board_feat_cache = OrderedDict()
+		self._board_feat_cache_size = 64
+		# (batch size, board, boards count) of last self.init_computation (to reuse allocated buffers)
+		self._last_init_key = None
 		# setting up neural network for root nodes of next street and current street leaf nodes
 		self.next_street_nn = ValueNn(street+1, approximate='root_nodes', pretrained_weights=True, verbose=0)
 		try:
@@ -35,49 +69,90 @@ class NextRoundValue():
 			only difference: it creates cumulative cfvs for every next board '''
 		BC, PC, batch_size, HC = self.next_boards_count, constants.players_count, self.batch_size, constants.hand_count
 		# init inputs and outputs to neural net
-		self.next_round_inputs = np.zeros([batch_size,BC,HC*PC + 1 + self.num_board_features], dtype=arguments.dtype)
-		self.next_round_values = np.zeros([batch_size,BC,PC,HC], dtype=arguments.dtype)
+		self.next_round_inputs = _get_scratch('next_round_inputs', [batch_size,BC,HC*PC + 1 + self.num_board_features], arguments.nn_io_dtype, self)
+		# (outputs are fully written by neural net on every self.evaluate_ranges, so they aren't zeroed)
+		self.next_round_values = _get_scratch('next_round_values', [batch_size,BC,PC,HC], arguments.nn_io_dtype, self, zeroed=False)
+		# flat views of contiguous inputs/outputs, that are passed to neural net: [b,B,...] -> [bxB,...]
+		self.next_round_inputs_flat = self.next_round_inputs.reshape([batch_size*BC,-1])
+		self.next_round_values_flat = self.next_round_values.reshape([batch_size*BC,-1])
+		assert(np.shares_memory(self.next_round_inputs_flat, self.next_round_inputs) and np.shares_memory(self.next_round_values_flat, self.next_round_values))
+		# preallocated buffers, reused in every self.evaluate_ranges call
+		self.next_round_ranges = _get_scratch('next_round_ranges', [batch_size,BC,PC,HC], arguments.dtype, self, zeroed=False)
+		self.next_round_ranges_sum = np.empty([batch_size,BC,PC], dtype=arguments.dtype)
+		# clipping bounds for every board, used when cfvs are not stored (see self._evaluate_root)
+		self.next_round_max_bounds = np.empty([batch_size,BC,PC,1], dtype=arguments.dtype)
+		self.next_round_min_bounds = np.empty([batch_size,BC,PC,1], dtype=arguments.dtype)
+		self.next_round_nonzero_norm = np.empty([batch_size,BC,PC], dtype=bool)
 		# handling board feature for nn [BC,69] and initing board masks (what hands are possible given that board)
-		next_boards_features = np.zeros([BC, self.num_board_features], dtype=arguments.dtype)
-		self.next_boards_mask = np.zeros([BC,HC], dtype=bool)
-		from tqdm import tqdm
-		for i, next_board in enumerate(tqdm(self.next_boards)):
-			next_boards_features[i] = card_tools.convert_board_to_nn_feature(next_board)
-			self.next_boards_mask[i] = card_tools.get_possible_hands_mask(next_board)
-		next_boards_features = np.expand_dims(next_boards_features, axis=0) # reshape: [B,69] -> [1,B,69]
-		# repeating next_boards_features: [ 1, B, 69 ] -> [ b, B, 69 ]
-		self.next_round_inputs[ : , : , PC*HC+1: ] = np.repeat(next_boards_features, batch_size, axis=0) # [ b, B, PxI +1+69 ] = [ b, B, 69 ]
-		# handling pot feature for nn
-		# repeating pot_sizes: [b,1] -> [b,B]
-		# [ b, B, P x I + 1 + 69 ] = [b,B] / scalar
-		self.next_round_inputs[ : , : , PC*HC ] = np.repeat(self.pot_sizes, BC, axis=1) / arguments.stack
+		# (next boards are the same for the same current board, so they are cached)
+		key = self.current_board_key
+		if key in self._board_feat_cache:
+			self._board_feat_cache.move_to_end(key)
+			next_boards_features, self.next_boards_mask = self._board_feat_cache[key]
+		else:
+			next_boards_features = np.zeros([BC, self.num_board_features], dtype=arguments.dtype)
+			self.next_boards_mask = np.zeros([BC,HC], dtype=bool)
+			fill_board_features(self.next_boards, next_boards_features)
+			fill_board_masks(self.next_boards, hand_cards_table, self.next_boards_mask)
+			self._board_feat_cache[key] = (next_boards_features.copy(), self.next_boards_mask.copy())
+			if len(self._board_feat_cache) > self._board_feat_cache_size:
+				self._board_feat_cache.popitem(last=False)
+		# same mask, but in ranges dtype (0/1), so multiplying ranges by it doesn't need type promotion
+		self.next_boards_float_mask = self.next_boards_mask.astype(arguments.dtype)
+		# broadcasting next_boards_features: [ B, 69 ] -> [ b, B, 69 ] (without materializing repeated copy)
+		self.next_round_inputs[ : , : , PC*HC+1: ] = next_boards_features[ np.newaxis ] # [ b, B, PxI +1+69 ] = [ 1, B, 69 ]
 		# init normalization (used to normalize values after masking with self.next_boards_mask)
 		num_possible_boards = card_combinations.count_next_boards_possible_boards(self.street)
 		self.root_nodes_sum_normalization = 1 / num_possible_boards
-		# init cumulative cfvs and their normalization (used for self.get_stored_value_on_board())
-		self.cumulative_norm = np.zeros([ batch_size, BC, PC ], dtype=arguments.dtype)
-		self.cumulative_cfvs = np.zeros([ batch_size, BC, PC, HC ], dtype=arguments.dtype)
+		# init cumulative cfvs and their normalization (used for self.get_stored_cfvs_of_all_next_round_boards())
+		# (zeroed in self._reset_approximation_vars)
+		self.cumulative_norm = np.empty([ batch_size, BC, PC ], dtype=arguments.dtype)
+		self.cumulative_cfvs = np.empty([ batch_size, BC, PC, HC ], dtype=arguments.dtype)
 
 
 	def _init_leaf_approximation_vars(self):
 		''' init datastructures, where input is only single board (self.current_board) '''
 		PC, batch_size, HC = constants.players_count, self.batch_size, constants.hand_count
 		# init inputs and outputs to neural net
-		self.current_round_inputs = np.zeros([batch_size, 1,HC*PC + 1 + self.num_board_features], dtype=arguments.dtype)
-		self.current_round_values = np.zeros([batch_size, 1,PC,HC], dtype=arguments.dtype)
+		self.current_round_inputs = np.zeros([batch_size, 1,HC*PC + 1 + self.num_board_features], dtype=arguments.nn_io_dtype)
+		self.current_round_values = np.zeros([batch_size, 1,PC,HC], dtype=arguments.nn_io_dtype)
+		# flat views of contiguous inputs/outputs, that are passed to neural net: [b,1,...] -> [b,...]
+		self.current_round_inputs_flat = self.current_round_inputs.reshape([batch_size,-1])
+		self.current_round_values_flat = self.current_round_values.reshape([batch_size,-1])
+		assert(self.current_round_inputs_flat.base is self.current_round_inputs and self.current_round_values_flat.base is self.current_round_values)
+		# preallocated buffers, reused in every self.evaluate_ranges call
+		self.current_round_ranges = np.empty([batch_size,1,PC,HC], dtype=arguments.dtype)
+		self.current_round_ranges_sum = np.empty([batch_size,1,PC], dtype=arguments.dtype)
 		# init current board's mask (possible hands, given that board)
 		self.current_board_mask = np.zeros([1,HC], dtype=bool)
 		self.current_board_mask[0] = card_tools.get_possible_hands_mask(self.current_board)
+		self.current_board_float_mask = self.current_board_mask.astype(arguments.dtype)
 		# fill inputs with board features
 		board_features = card_tools.convert_board_to_nn_feature(self.current_board)
-		board_features = np.expand_dims(board_features, axis=0) # reshape: [69] -> [1,69]
-		self.current_round_inputs[ : , 0, PC*HC+1: ] = np.repeat(board_features, batch_size, axis=0) # repeat: [1,69] -> [b,69]
-		# fill pot sizes factored by stack size
-		self.current_round_inputs[ : , : , PC*HC ] = self.pot_sizes / arguments.stack
+		self.current_round_inputs[ : , 0, PC*HC+1: ] = board_features # broadcast: [69] -> [b,69]
 		# init normalization (used to normalize values after masking with self.current_boards_mask)
 		self.leaf_nodes_sum_normalization = 1 / self.current_board_mask.sum()
 
 
+	def _reset_approximation_vars(self):
+		''' fills variables, that depend on pot sizes (not only on board and batch size)
+			or on previous re-solving, so they have to be set on every self.init_computation '''
+		PC, HC = constants.players_count, constants.hand_count
+		# handling pot feature for nn
+		# broadcasting pot_sizes: [b,1] -> [b,B]
+		# [ b, B, P x I + 1 + 69 ] = [b,1]
+		self.next_round_inputs[ : , : , PC*HC ] = self.pot_sizes_over_stack
+		self.current_round_inputs[ : , : , PC*HC ] = self.pot_sizes_over_stack
+		# reset cumulative cfvs and their normalization
+		self.cumulative_norm.fill(0)
+		self.cumulative_cfvs.fill(0)
+
+
+	def _owns_scratch(self):
+		''' checks if scratch buffers weren't taken by other NextRoundValue instance '''
+		return all( _SCRATCH_OWNERS.get(name) is self for name in ('next_round_inputs', 'next_round_values', 'next_round_ranges') )
+
+
 	def init_computation(self, board, pot_sizes, batch_size):
 		'''
 		@param: [0-5] :board with 0-5 card int values on it
@@ -85,20 +160,33 @@ class NextRoundValue():
 		@param: int   :batch of how many situations are evaluated simultaneously (usually will be = 1)
 		'''
 		self.iter = 0
+		self.leaf_iters_remaining = self.num_leaf_nodes_approximation_iters
 		# setting up current board and possible next boards
 		self.current_board = board
+		self.current_board_key = tuple(sorted(int(card) for card in board)) if board.ndim > 0 else ()
 		self.next_boards = card_tools.get_next_round_boards(self.current_board)
 		self.next_boards_count = self.next_boards.shape[0]
 		# init pot sizes [b, 1], where p - number of pot sizes, b - batch size (here not the same as in other files)
-		self.pot_sizes = np.repeat(pot_sizes.reshape([-1,1]), batch_size, axis=1)
-		self.pot_sizes = self.pot_sizes.reshape([-1,1])
+		self.pot_sizes = np.repeat(pot_sizes.reshape([-1]), batch_size).reshape([-1,1])
 		self.batch_size = self.pot_sizes.shape[0]
+		# pot feature for nn (same for root and leaf nodes approximation)
+		self.pot_sizes_over_stack = (self.pot_sizes / arguments.stack).astype(arguments.dtype)
 		# setting up num board features used in neural network (all boards will give same shape = 69)
 		self.num_board_features = card_tools.convert_board_to_nn_feature(np.zeros([])).shape[0]
 		# init variables, used for next street root nodes approximation
 		# and for current street leaf nodes approximation
-		self._init_root_approximation_vars()
-		self._init_leaf_approximation_vars()
+		# (re-solving same board with same batch size gives same shapes, so buffers are reused)
+		init_key = (self.batch_size, self.current_board_key, self.next_boards_count)
+		if init_key != self._last_init_key or not self._owns_scratch():
+			self._init_root_approximation_vars()
+			self._init_leaf_approximation_vars()
+			self._last_init_key = init_key
+		self._reset_approximation_vars()
+		# init clipping bounds for nn outputs (see self.evaluate_ranges)
+		# 20,000          > nn_value x pot_size > -20,000
+		# 20,000/pot_size >       nn_value      > -20,000/pot_size
+		self.max_values = (arguments.stack / self.pot_sizes).reshape([self.batch_size,1,1,1]).astype(arguments.dtype)
+		self.min_values = -self.max_values
 
 
 	def evaluate_ranges(self, ranges):
@@ -108,83 +196,125 @@ class NextRoundValue():
 		@param: [b,P,I] :ranges, here b is the number of states evaluated (must match input to self.init_computation)
 		@return [b,P,I] :cfvs, calculated by averaging all cfvs of next street/round boards
 		'''
-		PC, HC, batch_size = constants.players_count, constants.hand_count, self.batch_size
 		assert(ranges.shape[0] == self.batch_size)
 		self.iter += 1
-		# check to approximate leafs or next street nodes + avg them
-		if self.iter > self.num_leaf_nodes_approximation_iters:
-			BC = self.next_boards_count
-			neural_network = self.next_street_nn
-			nn_inputs = self.next_round_inputs
-			nn_outputs = self.next_round_values
-			mask = self.next_boards_mask
-			sum_normalization = self.root_nodes_sum_normalization
+		# first iterations approximate leafs, the rest next street nodes + avg them
+		if self.leaf_iters_remaining > 0:
+			self.leaf_iters_remaining -= 1
+			return self._evaluate_leaf(ranges)
+		return self._evaluate_root(ranges)
+
+
+	def _evaluate_leaf(self, ranges):
+		''' approximates cfvs of current street leaf nodes (single board: self.current_board)
+		@param: [b,P,I] :ranges
+		@return [b,P,I] :cfvs
+		'''
+		nn_outputs, values_norm = self._predict(ranges, self.leaf_nodes_nn, self.current_round_inputs_flat, self.current_round_values_flat,
+												self.current_round_values, self.current_round_ranges, self.current_round_ranges_sum,
+												self.current_board_float_mask)
+		self._denormalize(nn_outputs, values_norm)
+		# single board, so no need to sum over boards: [b,P,I] = [b,1,P,I] * scalar
+		return nn_outputs[ : , 0 ].astype(arguments.dtype) * self.leaf_nodes_sum_normalization
+
+
+	def _evaluate_root(self, ranges):
+		''' approximates cfvs of next street root nodes (all boards: self.next_boards) and averages them
+		@param: [b,P,I] :ranges
+		@return [b,P,I] :cfvs
+		'''
+		# scratch buffers could be taken by other street's instance (call self.init_computation again)
+		assert(self._owns_scratch())
+		nn_outputs, values_norm = self._predict(ranges, self.next_street_nn, self.next_round_inputs_flat, self.next_round_values_flat,
+												self.next_round_values, self.next_round_ranges, self.next_round_ranges_sum,
+												self.next_boards_float_mask)
+		# first iterations are ommited,
+		# we only use cfvs generated from root nodes (when transitioning from one street to another)
+		if self.iter > arguments.cfr_skip_iters:
+			self._denormalize(nn_outputs, values_norm)
+			# calculate normalized sum for each hand
+			# (summing in arguments.dtype, in case nn outputs are stored in lower precision arguments.nn_io_dtype)
+			current_board_values = np.sum(nn_outputs, axis=1, dtype=arguments.dtype) # [b,P,I] = sum([b,B,P,I], axis=1)
+			# save values in memory for later (use for self.get_stored_cfvs_of_all_next_round_boards())
+			np.add(self.cumulative_cfvs, nn_outputs, out=self.cumulative_cfvs)
+			np.add(self.cumulative_norm, values_norm, out=self.cumulative_norm)
 		else:
-			BC = 1
-			neural_network = self.leaf_nodes_nn
-			nn_inputs = self.current_round_inputs
-			nn_outputs = self.current_round_values
-			mask = self.current_board_mask
-			sum_normalization = self.leaf_nodes_sum_normalization
-		# copy ranges for all boards (BC)
-		ranges = ranges.reshape([batch_size,1,PC,HC]) # [b,P,I] -> [b,1,P,I]
-		ranges = np.repeat(ranges, BC, axis=1) # [b,1,P,I] -> [b,B,P,I]
-		# mask ranges for not possible hands (given some board (from 2nd axis))
-		ranges *= mask.reshape([1,BC,1,HC]) # [b,B,P,I] *= [1,B,1,I]
-		# normalizing ranges
-		ranges_sum = np.sum(ranges, axis=3) # [b,B,P] = sum([b,B,P,I], axis=2)
+			# values are not stored, so normalizing them is fused with summing over boards,
+			# clipping bounds are scaled instead: clip(v x n, -max, max) = clip(v, -max/n, max/n) x n
+			# (if n = 0, then v x n = 0 for any v, so bounds can be infinite)
+			max_bounds, min_bounds = self.next_round_max_bounds[ : , : , : , 0 ], self.next_round_min_bounds
+			np.not_equal(values_norm, 0, out=self.next_round_nonzero_norm)
+			max_bounds.fill(np.inf)
+			np.divide(self.max_values[ : , : , : , 0 ], values_norm, out=max_bounds, where=self.next_round_nonzero_norm) # [b,B,P] = [b,1,1] / [b,B,P]
+			np.negative(self.next_round_max_bounds, out=min_bounds)
+			np.clip(nn_outputs, min_bounds, self.next_round_max_bounds, out=nn_outputs) # [b,B,P,I] = clip([b,B,P,I], [b,B,P,1], [b,B,P,1])
+			current_board_values = np.einsum('bBpi,bBp->bpi', nn_outputs, values_norm, dtype=arguments.dtype) # [b,P,I] = sum([b,B,P,I] x [b,B,P,1], axis=1)
+		return current_board_values * self.root_nodes_sum_normalization # [b,P,I] = [b,P,I] * scalar
+
+
+	def _predict(self, ranges, neural_network, nn_inputs_flat, nn_outputs_flat, nn_outputs, ranges_buffer, ranges_sum, mask):
+		''' puts normalized ranges into nn inputs and computes cfvs for every board
+		@param: [b,P,I]         :ranges
+		@param: ValueNn         :neural network to use
+		@param: [bxB,PxI+1+69]  :flat nn inputs (with pot and board features already set)
+		@param: [bxB,PxI]       :flat view of nn outputs
+		@param: [b,B,P,I]       :nn outputs
+		@param: [b,B,P,I]       :buffer for normalized ranges
+		@param: [b,B,P]         :buffer for ranges sums
+		@param: [B,I]           :possible hands mask for every board
+		@return [b,B,P,I]       :nn outputs (not yet normalized back to original range sum, see self._denormalize)
+		@return [b,B,P]         :values normalization (ranges sums, swaped players)
+		'''
+		PC, HC = constants.players_count, constants.hand_count
+		batch_size, BC = ranges_buffer.shape[0], ranges_buffer.shape[1]
+		# copy ranges for all boards (BC), mask not possible hands (given some board (from 2nd axis))
+		# and normalize them, ranges_sum keeps sums before normalization
+		# [b,B,P,I], [b,B,P] = mask_normalize([b,P,I], [B,I])
+		mask_normalize(ranges, mask, ranges_buffer, ranges_sum)
 		# save var for later on to normalize output values (swaped just like at lookahead.get_results)
-		values_norm = np.zeros_like(ranges_sum)
-		values_norm[:,:,0] = ranges_sum[:,:,1].copy()
-		values_norm[:,:,1] = ranges_sum[:,:,0].copy()
-		# eliminating division by 0 and normalizing ranges
-		ranges_sum[ ranges_sum == 0 ] = 1
-		ranges /= np.expand_dims(ranges_sum, axis=-1) # [b,B,P,I] /= [b,B,P,1]
+		# (reversed view of players axis, no copy)
+		values_norm = ranges_sum[ : , : , ::-1 ]
 		# putting ranges into inputs
-		nn_inputs[ : , : , :PC*HC ] = ranges.reshape([batch_size,BC,PC*HC])
-		del ranges
+		nn_inputs_flat[ : , :PC*HC ] = ranges_buffer.reshape([batch_size*BC,PC*HC])
 		# computing value in the next round (outputs are already masked, see neural network)
-		neural_network.predict( nn_inputs.reshape([batch_size*BC,-1]), out=nn_outputs.reshape([batch_size*BC,-1]) )
+		neural_network.predict( nn_inputs_flat, out=nn_outputs_flat )
+		return nn_outputs, values_norm
+
+
+	def _denormalize(self, nn_outputs, values_norm):
+		''' normalizes nn outputs back to original range sum and clips them (inplace)
+		@param: [b,B,P,I] :nn outputs
+		@param: [b,B,P]   :values normalization (see self._predict)
+		'''
 		# normalizing values back to original range sum
-		nn_outputs *= values_norm.reshape([batch_size,BC,PC,1]) # [b,B,P,I] *= [b,1,P,1]
-		# clip values that are more then maximum
-		# 20,000          > nn_value x pot_size > -20,000
-		# 20,000/pot_size >       nn_value      > -20,000/pot_size
-		max_values = arguments.stack / self.pot_sizes.reshape([batch_size,1,1,1])
-		nn_outputs = np.clip(nn_outputs, -max_values, max_values) # [b,B,P,I] = clip([b,B,P,I], [b,1,1,1], [b,1,1,1])
-		# calculate normalized sum for each hand and return it
-		current_board_values = np.sum(nn_outputs, axis=1) * sum_normalization # [b,P,I] = sum([b,B,P,I], axis=1) * scalar
-		# first iterations are ommited and iterations from leaf nodes are ommited too,
-		# we only use cfvs generated from root nodes (when transitioning from one street to another)
-		if self.iter > arguments.cfr_skip_iters and self.iter > self.num_leaf_nodes_approximation_iters:
-			# save values in memory for later (use for self.get_stored_cfvs_of_all_next_round_boards())
-			self.cumulative_cfvs += nn_outputs
-			self.cumulative_norm += values_norm
-		return current_board_values
+		np.multiply(nn_outputs, values_norm[ : , : , : , np.newaxis ], out=nn_outputs) # [b,B,P,I] *= [b,B,P,1]
+		# clip values that are more then maximum (bounds are computed in self.init_computation)
+		np.clip(nn_outputs, self.min_values, self.max_values, out=nn_outputs) # [b,B,P,I] = clip([b,B,P,I], [b,1,1,1], [b,1,1,1])
 
 
 	def get_stored_cfvs_of_all_next_round_boards(self):
-		''' returns stored cfvs for all next boards (computed during resolving) '''
-		# remove divison by 0
-		self.cumulative_norm[ self.cumulative_norm == 0 ] = 1
-		# [b,B,P,I] /= [b,B,P,1] (normalize cfvs)
-		self.cumulative_cfvs /= np.expand_dims(self.cumulative_norm, axis=-1)
-		return self.cumulative_cfvs
+		''' returns stored cfvs for all next boards (computed during resolving)
+			(doesn't change cumulative cfvs, so it can be called multiple times)
+		'''
+		norm = self.cumulative_norm[ : , : , : , np.newaxis ]
+		# [b,B,P,I] = [b,B,P,I] / [b,B,P,1] (normalize cfvs)
+		# (where norm is 0 cumulative cfvs are 0 too, so they are left as zeros instead of dividing by 0)
+		out = np.zeros_like(self.cumulative_cfvs)
+		np.divide(self.cumulative_cfvs, norm, out=out, where=norm != 0)
+		return out
 
 
 
 
 
+# NextRoundValue for every street, created on first use (loads only needed neural networks)
 NEXT_ROUND_VALUES = {}
-for street in range(1,4):
-	street_name = card_to_string.street_to_name(street)
-	try:
-		NEXT_ROUND_VALUES[street] = NextRoundValue( street, skip_iterations=arguments.cfr_skip_iters,
-													leaf_nodes_iterations=arguments.leaf_nodes_iterations[street_name] )
-	except:
-		print(f"Didn't find neural network for street {street}... In case if this street's nn is not needed, program will not stop.")
 
 def get_next_round_value(street):
+	if street not in NEXT_ROUND_VALUES:
+		street_name = card_to_string.street_to_name(street)
+		NEXT_ROUND_VALUES[street] = NextRoundValue( street, skip_iterations=arguments.cfr_skip_iters,
+													leaf_nodes_iterations=arguments.leaf_nodes_iterations[street_name] )
 	return NEXT_ROUND_VALUES[street]
 
 
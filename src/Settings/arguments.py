@@ -9,6 +9,10 @@ class Parameters():
 		# the tensor datatype used for storing DeepStack's internal data
 		self.dtype = np.float32
 		self.int_dtype = np.int16
+		# the datatype used for storing neural network inputs/outputs while re-solving
+		# (np.float16 halves their memory, but cfvs are denormalized in that buffer,
+		# so small range sums lose precision and solver output changes)
+		self.nn_io_dtype = np.float32
 		# cached results path (caching only first street)
 		self.cache_path = './data/cache/'
 		# self.cache_path = r'D:\Datasets\Pystack\cache'